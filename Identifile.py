@@ -126,6 +126,55 @@ SIGNATURES = {
 }
 
 
+# -------------------------------------------------------------------------
+# Byte trie over the "start" magics in SIGNATURES
+# -------------------------------------------------------------------------
+_TRIE_MATCH = -1  # Node key listing formats whose start magic ends at that node
+
+_SIG_TRIE: Dict[int, Any] = {}
+_TRIE_DEPTH = 0  # Length of the longest indexed start magic
+_TRIE_INDEXED: Dict[str, Tuple[bytes, ...]] = {}  # Format -> start magics it was indexed with
+
+
+def _trie_insert(format_name: str, signature: Dict[str, Any]) -> None:
+    """Index one signature's start magics in the trie."""
+    global _TRIE_DEPTH
+    for magic in signature.get("start", ()):
+        if not magic:
+            continue
+        node = _SIG_TRIE
+        for byte in magic:
+            node = node.setdefault(byte, {})
+        node.setdefault(_TRIE_MATCH, set()).add(format_name)
+        _TRIE_DEPTH = max(_TRIE_DEPTH, len(magic))
+    _TRIE_INDEXED[format_name] = tuple(signature.get("start", ()))
+
+
+def _rebuild_signature_trie() -> None:
+    """Rebuild the start-magic trie from the current SIGNATURES table."""
+    global _TRIE_DEPTH
+    _SIG_TRIE.clear()
+    _TRIE_INDEXED.clear()
+    _TRIE_DEPTH = 0
+    for fmt, sig in SIGNATURES.items():
+        _trie_insert(fmt, sig)
+
+
+def _match_start_magics(head: bytes) -> set:
+    """Return every format whose start magic is a prefix of head, in one trie descent."""
+    matched = set()
+    node = _SIG_TRIE
+    for byte in head[:_TRIE_DEPTH]:
+        node = node.get(byte)
+        if node is None:
+            break
+        matched.update(node.get(_TRIE_MATCH, ()))
+    return matched
+
+
+_rebuild_signature_trie()
+
+
 # -------------------------------------------------------------------------
 # Helpers for signature sniffing
 # -------------------------------------------------------------------------
@@ -174,15 +223,19 @@ def _read_ranges(fp: BinaryIO, head_n: int = 64, tail_n: int = 64,
 
 def _detect_from_ranges(head: bytes, tail: bytes, tar_slice: bytes) -> Identifile:
     """Apply signature checks to the extracted byte ranges."""
+    # A tuple argument keeps the per-pattern loop inside bytes.startswith/endswith;
+    # empty patterns are filtered out so they never match trivially.
     def starts_with_any(buf: bytes, patterns: list) -> bool:
-        return any(buf.startswith(p) for p in patterns if p)
+        return buf.startswith(tuple(filter(None, patterns)))
 
     def ends_with_any(buf: bytes, patterns: list) -> bool:
-        return any(buf.endswith(p) for p in patterns if p)
+        return buf.endswith(tuple(filter(None, patterns)))
 
     def contains_any(buf: bytes, patterns: list) -> bool:
         return any(p in buf for p in patterns if p)
 
+    start_matches = _match_start_magics(head)
+
     # Check in priority order (more specific first)
     for fmt, sig in SIGNATURES.items():
         confidence = sig.get("confidence", 1.0)
@@ -194,8 +247,13 @@ def _detect_from_ranges(head: bytes, tail: bytes, tar_slice: bytes) -> Identifil
 
         match = True
 
-        if "start" in sig and not starts_with_any(head, sig["start"]):
-            match = False
+        if "start" in sig:
+            # Magics changed since indexing (replaced or edited in place) are scanned directly
+            if _TRIE_INDEXED.get(fmt) == tuple(sig["start"]):
+                if fmt not in start_matches:
+                    match = False
+            elif not starts_with_any(head, sig["start"]):
+                match = False
         if "end" in sig and not ends_with_any(tail, sig["end"]):
             match = False
         if "end_contains" in sig and not contains_any(tail, sig["end_contains"]):
@@ -227,9 +285,6 @@ def sniff_format(file_path: str, head_n: int = 64, tail_n: int = 64,
     Returns:
         Identifile object.
     """
-    if not os.path.exists(file_path):
-        return Identifile("unknown", 0.0, "File not found.", {})
-    
     try:
         with open(file_path, "rb") as fp:
             head, tail, tar_slice = _read_ranges(fp, head_n, tail_n)
@@ -246,6 +301,8 @@ def sniff_format(file_path: str, head_n: int = 64, tail_n: int = 64,
                 )
         
         return detection
+    except FileNotFoundError:
+        return Identifile("unknown", 0.0, "File not found.", {})
     except Exception as e:
         return Identifile("unknown", 0.0, f"I/O error: {str(e)}", {})
 
@@ -329,7 +386,16 @@ def add_signature(format_name: str, signature: Dict[str, Any], overwrite: bool =
     
     Raises:
         ValueError: If format_name exists and overwrite=False.
+    
+    Note:
+        Prefer this over assigning to SIGNATURES directly, so the start-magic
+        trie used by the sniffers stays in sync.
     """
     if format_name in SIGNATURES and not overwrite:
         raise ValueError(f"Signature for '{format_name}' already exists. Use overwrite=True to update.")
-    SIGNATURES[format_name] = signature
\ No newline at end of file
+    SIGNATURES[format_name] = signature
+    if format_name in _TRIE_INDEXED:
+        # Old magics for this name are still in the trie; drop them by rebuilding
+        _rebuild_signature_trie()
+    else:
+        _trie_insert(format_name, signature)
\ No newline at end of file
@@ -1,202 +1,258 @@
+import copy
+import gc
+import sys
 import unittest
-from io import BytesIO
+from functools import lru_cache
+from io import BytesIO, RawIOBase
 from typing import Dict
 import os
+import shutil
 import tempfile
 
 # Assuming the library is saved as fileformatdetect.py and imported here.
 # If it's in the same file, adjust accordingly.
-from Identifile import add_signature, sniff_stream, sniff_format, SIGNATURES
+from Identifile import add_signature, sniff_stream, sniff_format, SIGNATURES, _rebuild_signature_trie
 
-class TestIdentifile(unittest.TestCase):
-    """
-    Unit tests for the file format detection library.
-    Covers all supported formats, unknown cases, and extension hints.
+# Shared payload pieces, built once at import time.
+_PAD100 = bytes(100)
+_PAD200 = bytes(200)
+_ZIP_CASES = (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08')
+
+
+def _orc_payload() -> bytes:
+    """Zero-filled body ending in the ORC postscript magic."""
+    buf = bytearray(103)
+    buf[-3:] = b'ORC'
+    return bytes(buf)
+
+
+def _tar_payload(magic: bytes, offset: int = 257) -> bytes:
+    """Zero-filled body with a tar magic written at offset, followed by 100 bytes of padding."""
+    buf = bytearray(offset + len(magic) + 100)
+    buf[offset:offset + len(magic)] = magic
+    return bytes(buf)
+
+
+_ORC_BYTES = _orc_payload()
+_TAR_USTAR0_BYTES = _tar_payload(b'ustar\x00')
+_TAR_USTAR_SP_BYTES = _tar_payload(b'ustar  ')
+_TAR_CASES = ((b'ustar\x00', _TAR_USTAR0_BYTES), (b'ustar  ', _TAR_USTAR_SP_BYTES))
+
+
+def _expected(fmt: str, evidence: str, category: str = '', conf: float = 1.0) -> Dict[str, object]:
+    """Build the keyword arguments _assert_det expects for one format."""
+    flags = {'compressed': False, 'archive': False, 'columnar': False}
+    if category:
+        flags[category] = True
+    return {'fmt': fmt, 'conf': conf, 'evidence': evidence, **flags}
+
+
+# Expected detection fields per format, keyed by format name.
+_EXPECTED = {e['fmt']: e for e in (
+    _expected('gzip', "Starts with 1f 8b (gzip).", 'compressed'),
+    _expected('zstd', "Starts with 28 b5 2f fd (zstd).", 'compressed'),
+    _expected('bzip2', "Starts with 'BZh' (bzip2).", 'compressed'),
+    _expected('lz4-frame', "Starts with 04 22 4d 18 (LZ4 frame).", 'compressed'),
+    _expected('xz', "Starts with fd 37 7a 58 5a 00 (XZ).", 'compressed'),
+    _expected('zip', "Starts with PK (ZIP container).", 'archive'),
+    _expected('7z', "Starts with 37 7a bc af 27 1c (7z archive).", 'archive'),
+    _expected('snappy-framed', "Starts with ff 06 00 00 'sNaPpY' (Snappy framed).", 'compressed'),
+    _expected('snappy-snz', "Starts with 'SNZ\\x01' (obsolete Snappy SNZ format).", 'compressed'),
+    _expected('brotli', "First byte in range 0x91-0x9F (Brotli heuristic).", 'compressed', conf=0.5),
+    _expected('parquet', "Has 'PAR1' at start and end (Parquet).", 'columnar'),
+    _expected('orc', "Tail contains 'ORC' in postscript (ORC).", 'columnar'),
+    _expected('tar', "Has 'ustar' at offset 257 (TAR).", 'archive'),
+    _expected('unknown', "No decisive signature found.", conf=0.0),
+)}
+
+# (magic, format) for formats identified by their leading bytes alone.
+_HEAD_MAGIC_CASES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'BZh', 'bzip2'),
+    (b'\x04\x22\x4d\x18', 'lz4-frame'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x37\x7a\xbc\xaf\x27\x1c', '7z'),
+    (b'\xff\x06\x00\x00sNaPpY', 'snappy-framed'),
+    (b'SNZ\x01', 'snappy-snz'),
+) + tuple((magic, 'zip') for magic in _ZIP_CASES)
+
+
+class NonSeekableStream(RawIOBase):
+    """Read-only, non-seekable stream over a bytes payload, backed by a memoryview."""
+
+    def __init__(self, data: bytes):
+        self._mv = memoryview(data)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def read(self, n: int = -1) -> bytes:
+        remaining = len(self._mv) - self._pos
+        if n < 0 or n > remaining:
+            n = remaining
+        out = bytes(self._mv[self._pos:self._pos + n])
+        self._pos += n
+        return out
+
+    def reset(self) -> None:
+        """Rewind to the start so one instance can back several sniffs."""
+        self._pos = 0
+
+
+_saved_switchinterval = sys.getswitchinterval()
+
+
+def setUpModule():
+    # Keep interpreter thread switches from interrupting short tests
+    sys.setswitchinterval(1.0)
+
+
+def tearDownModule():
+    sys.setswitchinterval(_saved_switchinterval)
+
+
+@lru_cache(maxsize=None)
+def _sniff_cached(data: bytes):
     """
+    Memoized sniff_stream for read-only tests; detection is pure for a given payload.
 
-    def _create_stream(self, data: bytes) -> BytesIO:
-        """Helper to create a seekable BytesIO stream."""
-        return BytesIO(data)
+    Every caller with the same payload gets the same Identifile object, so treat
+    the result as read-only: mutating it would leak into unrelated tests.
+    """
+    return sniff_stream(BytesIO(data))
 
-    def _create_temp_file(self, data: bytes, extension: str = '') -> str:
-        """Helper to create a temporary file for sniff_format testing."""
-        fd, path = tempfile.mkstemp(suffix=extension)
-        with os.fdopen(fd, 'wb') as f:
-            f.write(data)
-        return path
 
-    def _cleanup_temp_file(self, path: str):
-        """Cleanup temporary file."""
-        if os.path.exists(path):
-            os.remove(path)
+class _GCPausedTestCase(unittest.TestCase):
+    """Base class that keeps the garbage collector out of each test body."""
 
-    def test_gzip(self):
-        data = b'\x1f\x8b' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'gzip')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with 1f 8b (gzip).")
+    def setUp(self):
+        # Collect up front; the cleanup re-enables GC even if a subclass setUp fails
+        gc.collect()
+        gc.disable()
+        self.addCleanup(gc.enable)
 
-    def test_zstd(self):
-        data = b'\x28\xb5\x2f\xfd' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'zstd')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with 28 b5 2f fd (zstd).")
 
-    def test_bzip2(self):
-        data = b'BZh' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'bzip2')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with 'BZh' (bzip2).")
+class TestIdentifile(_GCPausedTestCase):
+    """
+    Unit tests for the file format detection library.
+    Covers all supported formats, unknown cases, and extension hints.
+    """
 
-    def test_lz4_frame(self):
-        data = b'\x04\x22\x4d\x18' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'lz4-frame')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with 04 22 4d 18 (LZ4 frame).")
+    @classmethod
+    def setUpClass(cls):
+        # One scratch directory per class; prefer tmpfs so writes stay in memory.
+        cls._tmpdir = tempfile.mkdtemp(dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+        cls._gz_path = cls._create_temp_file('f.gz', b'\x1f\x8b' + _PAD100)
+        cls._snz_path = cls._create_temp_file('f.snz', _PAD100)
 
-    def test_xz(self):
-        data = b'\xfd7zXZ\x00' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'xz')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with fd 37 7a 58 5a 00 (XZ).")
-
-    def test_zip(self):
-        for start in [b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08']:
-            data = start + b'\x00' * 100
-            stream = self._create_stream(data)
-            det = sniff_stream(stream)
-            self.assertEqual(det.format, 'zip')
-            self.assertEqual(det.confidence, 1.0)
-            self.assertTrue(det.is_archive())
-            self.assertEqual(det.evidence, "Starts with PK (ZIP container).")
-
-    def test_7z(self):
-        data = b'\x37\x7a\xbc\xaf\x27\x1c' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, '7z')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_archive())
-        self.assertEqual(det.evidence, "Starts with 37 7a bc af 27 1c (7z archive).")
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._tmpdir)
 
-    def test_snappy_framed(self):
-        data = b'\xff\x06\x00\x00sNaPpY' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'snappy-framed')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with ff 06 00 00 'sNaPpY' (Snappy framed).")
+    def setUp(self):
+        super().setUp()
+        self._stream = BytesIO()
 
-    def test_snappy_snz(self):
-        data = b'SNZ\x01' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'snappy-snz')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "Starts with 'SNZ\\x01' (obsolete Snappy SNZ format).")
+    def _create_stream(self, data: bytes) -> BytesIO:
+        """Helper to refill the per-test seekable BytesIO stream with data."""
+        self._stream.seek(0)
+        self._stream.truncate(0)
+        self._stream.write(data)
+        self._stream.seek(0)
+        return self._stream
+
+    @classmethod
+    def _create_temp_file(cls, name: str, data: bytes) -> str:
+        """Helper to write a file into the class scratch directory for sniff_format testing."""
+        path = os.path.join(cls._tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
 
-    def test_brotli(self):
-        # Test with first byte 0x91
-        data = b'\x91' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'brotli')
-        self.assertEqual(det.confidence, 0.5)
-        self.assertTrue(det.is_compressed())
-        self.assertEqual(det.evidence, "First byte in range 0x91-0x9F (Brotli heuristic).")
+    def _assert_det(self, det, *, fmt: str, conf: float, evidence: str,
+                    compressed: bool = False, archive: bool = False, columnar: bool = False):
+        """Helper to compare a detection against its expected fields in a single assertion."""
+        actual = {
+            'format': det.format,
+            'confidence': det.confidence,
+            'evidence': det.evidence,
+            'compressed': det.is_compressed(),
+            'archive': det.is_archive(),
+            'columnar': det.is_columnar(),
+        }
+        expected = {
+            'format': fmt,
+            'confidence': conf,
+            'evidence': evidence,
+            'compressed': compressed,
+            'archive': archive,
+            'columnar': columnar,
+        }
+        self.assertEqual(actual, expected)
 
-        # Test upper range 0x9F
-        data = b'\x9F' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'brotli')
-        self.assertEqual(det.confidence, 0.5)
+    def test_head_magic(self):
+        for magic, fmt in _HEAD_MAGIC_CASES:
+            with self.subTest(fmt=fmt, magic=magic):
+                det = _sniff_cached(magic + _PAD100)
+                self._assert_det(det, **_EXPECTED[fmt])
 
-        # Negative test: outside range
-        data = b'\x90' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'unknown')
+    def test_brotli(self):
+        # Only the first byte differs between probes, so patch it in place
+        buf = bytearray(101)
+        for first, fmt in [(0x91, 'brotli'), (0x9F, 'brotli'), (0x90, 'unknown')]:
+            buf[0] = first
+            with self.subTest(byte=first):
+                det = _sniff_cached(bytes(buf))
+                self._assert_det(det, **_EXPECTED[fmt])
 
     def test_parquet(self):
-        data = b'PAR1' + b'\x00' * 100 + b'PAR1'
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'parquet')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_columnar())
-        self.assertEqual(det.evidence, "Has 'PAR1' at start and end (Parquet).")
+        data = b'PAR1' + _PAD100 + b'PAR1'
+        det = _sniff_cached(data)
+        self._assert_det(det, **_EXPECTED['parquet'])
 
         # Negative: missing end
-        data = b'PAR1' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
+        data = b'PAR1' + _PAD100
+        det = _sniff_cached(data)
         self.assertEqual(det.format, 'unknown')
 
     def test_orc(self):
-        data = b'\x00' * 100 + b'ORC'
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'orc')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_columnar())
-        self.assertEqual(det.evidence, "Tail contains 'ORC' in postscript (ORC).")
+        data = _ORC_BYTES
+        det = _sniff_cached(data)
+        self._assert_det(det, **_EXPECTED['orc'])
 
         # Negative: no 'ORC' in tail
-        data = b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
+        data = _PAD100
+        det = _sniff_cached(data)
         self.assertEqual(det.format, 'unknown')
 
     def test_tar(self):
-        # 'ustar\x00' at offset 257
-        data = b'\x00' * 257 + b'ustar\x00' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'tar')
-        self.assertEqual(det.confidence, 1.0)
-        self.assertTrue(det.is_archive())
-        self.assertEqual(det.evidence, "Has 'ustar' at offset 257 (TAR).")
-
-        # Alternative magic 'ustar  '
-        data = b'\x00' * 257 + b'ustar  ' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'tar')
-        self.assertEqual(det.confidence, 1.0)
+        # 'ustar\x00' or 'ustar  ' at offset 257
+        for magic, data in _TAR_CASES:
+            with self.subTest(magic=magic):
+                stream = self._create_stream(data)
+                det = sniff_stream(stream)
+                self._assert_det(det, **_EXPECTED['tar'])
 
         # Negative: wrong position
-        data = b'\x00' * 256 + b'ustar\x00' + b'\x00' * 100
+        data = _tar_payload(b'ustar\x00', offset=256)
         stream = self._create_stream(data)
         det = sniff_stream(stream)
         self.assertEqual(det.format, 'unknown')
 
     def test_snappy_raw_with_extension_hint(self):
         # No signature, rely on hint
-        data = b'\x00' * 100  # Arbitrary data
+        data = _PAD100  # Arbitrary data
         stream = self._create_stream(data)
         det = sniff_stream(stream, extension_hint='.snz')
         self.assertEqual(det.format, 'snappy-raw')
         self.assertEqual(det.confidence, 0.5)
         self.assertTrue(det.is_compressed())
-        self.assertIn('Based on extension hint', det.evidence)
+        self.assertEqual(det.evidence, "Based on extension hint '.snz', likely raw Snappy (no header).")
 
         # Test other extensions
         det = sniff_stream(stream, extension_hint='.snappy')
@@ -209,59 +265,34 @@ class TestIdentifile(unittest.TestCase):
         self.assertEqual(det.format, 'unknown')
 
     def test_unknown(self):
-        data = b'random_data_without_signature' + b'\x00' * 100
+        data = b'random_data_without_signature' + _PAD100
         stream = self._create_stream(data)
         det = sniff_stream(stream)
-        self.assertEqual(det.format, 'unknown')
-        self.assertEqual(det.confidence, 0.0)
+        self._assert_det(det, **_EXPECTED['unknown'])
         self.assertFalse(det.is_known())
-        self.assertEqual(det.evidence, "No decisive signature found.")
 
     def test_sniff_format_with_file(self):
         # Test with a temp file for gzip
-        data = b'\x1f\x8b' + b'\x00' * 100
-        path = self._create_temp_file(data)
-        try:
-            det = sniff_format(path)
-            self.assertEqual(det.format, 'gzip')
-        finally:
-            self._cleanup_temp_file(path)
+        det = sniff_format(self._gz_path)
+        self.assertEqual(det.format, 'gzip')
 
         # Test extension hint with .snz
-        data = b'\x00' * 100
-        path = self._create_temp_file(data, '.snz')
-        try:
-            det = sniff_format(path)
-            self.assertEqual(det.format, 'snappy-raw')
-            self.assertEqual(det.confidence, 0.5)
-
-            # Disable hint
-            det = sniff_format(path, use_extension_hint=False)
-            self.assertEqual(det.format, 'unknown')
-        finally:
-            self._cleanup_temp_file(path)
+        det = sniff_format(self._snz_path)
+        self.assertEqual(det.format, 'snappy-raw')
+        self.assertEqual(det.confidence, 0.5)
 
-    def test_non_seekable_stream_partial(self):
-        # Simulate non-seekable stream by reading head only
-        class NonSeekableStream:
-            def __init__(self, data):
-                self.data = data
-                self.pos = 0
-
-            def read(self, n=-1):
-                if n == -1:
-                    result = self.data[self.pos:]
-                    self.pos = len(self.data)
-                else:
-                    result = self.data[self.pos:self.pos + n]
-                    self.pos += len(result)
-                return result
-
-            def seekable(self):
-                return False
+        # Disable hint
+        det = sniff_format(self._snz_path, use_extension_hint=False)
+        self.assertEqual(det.format, 'unknown')
 
+        # Missing file
+        det = sniff_format(os.path.join(self._tmpdir, 'missing.gz'))
+        self.assertEqual(det.format, 'unknown')
+        self.assertEqual(det.evidence, 'File not found.')
+
+    def test_non_seekable_stream_partial(self):
         # Test head-based format (gzip)
-        data = b'\x1f\x8b' + b'\x00' * 100
+        data = b'\x1f\x8b' + _PAD100
         stream = NonSeekableStream(data)
         det = sniff_stream(stream, buffer_non_seekable=False)
         self.assertEqual(det.format, 'gzip')
@@ -269,17 +300,64 @@ class TestIdentifile(unittest.TestCase):
         self.assertIn('partial detection', det.evidence)
 
         # Test tail-based format (orc) - should fail to unknown without buffering
-        data = b'\x00' * 100 + b'ORC'
+        data = _ORC_BYTES
         stream = NonSeekableStream(data)
         det = sniff_stream(stream, buffer_non_seekable=False)
         self.assertEqual(det.format, 'unknown')
 
         # With buffering, should detect
-        stream = NonSeekableStream(data)
+        stream.reset()
         det = sniff_stream(stream, buffer_non_seekable=True)
         self.assertEqual(det.format, 'orc')
         self.assertEqual(det.confidence, 1.0)
 
+    def test_small_file(self):
+        # Both probes share the per-test stream, truncated in between
+        buf = self._stream
+
+        # Test file smaller than probes
+        buf.write(b'\x1f\x8b')  # Only 2 bytes
+        buf.seek(0)
+        det = sniff_stream(buf)
+        self.assertEqual(det.format, 'gzip')  # Still detects start
+
+        # Tar with small size (less than 257 + 8)
+        buf.seek(0)
+        buf.truncate()
+        buf.write(_PAD200)
+        buf.seek(0)
+        det = sniff_stream(buf)
+        self.assertEqual(det.format, 'unknown')  # No tar slice
+
+    def test_summary_and_metadata(self):
+        data = b'\x1f\x8b' + _PAD100
+        stream = self._create_stream(data)
+        det = sniff_stream(stream)
+        self.assertEqual(det.summary(), '[GZIP] confidence=1.00 – Starts with 1f 8b (gzip).')
+        meta = det.metadata()
+        self.assertEqual(meta['format'], 'gzip')
+        self.assertTrue(meta['is_compressed'])
+        self.assertFalse(meta['is_archive'])
+        self.assertFalse(meta['is_columnar'])
+
+
+class TestAddSignature(_GCPausedTestCase):
+    """
+    Tests that mutate the global SIGNATURES table.
+    Kept apart from the read-only tests and restored after each test so
+    they cannot leak into other test cases.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Deep copy so in-place edits to individual entries are undone too
+        self._saved_signatures = copy.deepcopy(SIGNATURES)
+
+    def tearDown(self):
+        SIGNATURES.clear()
+        SIGNATURES.update(self._saved_signatures)
+        _rebuild_signature_trie()
+
     def test_add_signature(self):
         # Test adding a custom signature
         custom_sig = {
@@ -288,47 +366,47 @@ class TestIdentifile(unittest.TestCase):
         }
         add_signature('custom', custom_sig)
 
-        data = b'\xAA\xBB' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
+        data = b'\xAA\xBB' + _PAD100
+        det = sniff_stream(BytesIO(data))
         self.assertEqual(det.format, 'custom')
         self.assertEqual(det.confidence, 1.0)
 
-        # Cleanup: remove custom
-        del SIGNATURES['custom']
-
         # Test overwrite
         with self.assertRaises(ValueError):
             add_signature('gzip', custom_sig, overwrite=False)
-        add_signature('gzip', custom_sig, overwrite=True)  # Overwrite temporarily
-        SIGNATURES['gzip'] = {  # Restore original
-            "start": [b"\x1f\x8b"],
-            "evidence": "Starts with 1f 8b (gzip).",
+        add_signature('gzip', custom_sig, overwrite=True)
+        self.assertIs(SIGNATURES['gzip'], custom_sig)
+
+        # Overwritten magics take effect and the old ones no longer match
+        det = sniff_stream(BytesIO(data))
+        self.assertEqual(det.format, 'gzip')
+        det = sniff_stream(BytesIO(b'\x1f\x8b' + _PAD100))
+        self.assertEqual(det.format, 'unknown')
+
+    def test_direct_signature_assignment(self):
+        # Entries swapped in without add_signature are still honoured
+        SIGNATURES['gzip'] = {
+            "start": [b'\xCC\xDD'],
+            "evidence": "Replaced gzip start.",
         }
+        det = sniff_stream(BytesIO(b'\xCC\xDD' + _PAD100))
+        self.assertEqual(det.format, 'gzip')
+        det = sniff_stream(BytesIO(b'\x1f\x8b' + _PAD100))
+        self.assertEqual(det.format, 'unknown')
 
-    def test_small_file(self):
-        # Test file smaller than probes
-        data = b'\x1f\x8b'  # Only 2 bytes
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'gzip')  # Still detects start
+    def test_in_place_signature_edit(self):
+        # Magics appended to an existing entry are honoured
+        SIGNATURES['gzip']['start'].append(b'\x1f\x9d')
+        det = sniff_stream(BytesIO(b'\x1f\x9d' + _PAD100))
+        self.assertEqual(det.format, 'gzip')
 
-        # Tar with small size (less than 257 + 8)
-        data = b'\x00' * 200
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.format, 'unknown')  # No tar slice
+        # A replaced magic list takes effect and the old magic no longer matches
+        SIGNATURES['zstd']['start'] = [b'ZZZZ']
+        det = sniff_stream(BytesIO(b'ZZZZ' + _PAD100))
+        self.assertEqual(det.format, 'zstd')
+        det = sniff_stream(BytesIO(b'\x28\xb5\x2f\xfd' + _PAD100))
+        self.assertEqual(det.format, 'unknown')
 
-    def test_summary_and_metadata(self):
-        data = b'\x1f\x8b' + b'\x00' * 100
-        stream = self._create_stream(data)
-        det = sniff_stream(stream)
-        self.assertEqual(det.summary(), '[GZIP] confidence=1.00 – Starts with 1f 8b (gzip).')
-        meta = det.metadata()
-        self.assertEqual(meta['format'], 'gzip')
-        self.assertTrue(meta['is_compressed'])
-        self.assertFalse(meta['is_archive'])
-        self.assertFalse(meta['is_columnar'])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file